@@ -0,0 +1,90 @@
+"""
+Программный интерфейс прувера без интерактивного режима App.
+
+Модуль ничего не импортирует при загрузке: парсер, прувер и библиотека аксиом
+подгружаются при первом вызове, поэтому короткоживущие процессы стартуют быстро.
+"""
+
+__all__ = ['parse', 'prove', 'prove_many', 'set_backend', 'get_backend', 'BACKENDS']
+
+# Доступные бэкенды доказательства: имя -> модуль с классом Prover и функцией prove_many
+BACKENDS = {
+    'sequent': 'Prover',
+}
+
+backend_name = 'sequent'  # Текущий бэкенд
+default_axioms = None  # Библиотека аксиом Гильберта, создаётся при первом доказательстве
+
+
+def set_backend(name: str):
+    """
+    Выбирает бэкенд доказательства; модуль бэкенда загружается при первом доказательстве.
+    :param name: Имя бэкенда из BACKENDS.
+    """
+    global backend_name
+    if name not in BACKENDS:
+        raise ValueError(f"Неизвестный бэкенд: {name}. Доступны: {', '.join(BACKENDS)}")
+    backend_name = name
+
+
+def get_backend() -> str:
+    """Имя текущего бэкенда"""
+    return backend_name
+
+
+def load_backend():
+    """Загружает (один раз) модуль текущего бэкенда"""
+    import importlib
+    return importlib.import_module(BACKENDS[backend_name])
+
+
+def parse(expression: str):
+    """
+    Разбирает строку в выражение.
+    :param expression: Выражение в синтаксисе App, например "A>(B>A)".
+    :return: Expression.
+    """
+    from Parser import Parser, KEYWORDS
+    return Parser(expression, KEYWORDS).parse()
+
+
+def load_axioms(axioms):
+    """Приводит аксиомы к виду, который принимает Prover; по умолчанию — аксиомы Гильберта"""
+    global default_axioms
+    from Library import AxiomLibrary, HILBERT_AXIOMS
+    if isinstance(axioms, AxiomLibrary):
+        return axioms
+    if axioms is not None:
+        return [parse(axiom) if isinstance(axiom, str) else axiom for axiom in axioms]
+    if default_axioms is None:
+        library = AxiomLibrary()
+        for axiom in HILBERT_AXIOMS:
+            library.add(parse(axiom))
+        default_axioms = library
+    return default_axioms
+
+
+def prove(expression, axioms=None, log=None) -> bool:
+    """
+    Доказывает выражение.
+    :param expression: Строка или Expression.
+    :param axioms: Список аксиом (строк или Expression) или AxiomLibrary; по умолчанию аксиомы Гильберта.
+    :param log: Функция вывода хода доказательства (по умолчанию вывод отключён).
+    :return: True, если выражение доказано.
+    """
+    if isinstance(expression, str):
+        expression = parse(expression)
+    return load_backend().Prover(load_axioms(axioms), expression, log=log).prove()
+
+
+def prove_many(expressions, axioms=None, commutative: bool = False, log=None) -> list[bool]:
+    """
+    Доказывает набор выражений, один раз на каждый класс переименования переменных.
+    :param expressions: Строки или Expression.
+    :param axioms: Как в prove.
+    :param commutative: Объединять ли выражения, отличающиеся порядком операндов ∧, ∨, +, =.
+    :param log: Функция вывода хода доказательства (по умолчанию вывод отключён).
+    :return: Результаты в порядке expressions.
+    """
+    targets = [parse(expression) if isinstance(expression, str) else expression for expression in expressions]
+    return load_backend().prove_many(load_axioms(axioms), targets, commutative, log)
@@ -1,28 +1,105 @@
+import os
 from Parser import *
 from Prover import *
+from Library import AxiomLibrary, HILBERT_AXIOMS
 from time import time
 
 
 class App:
-    def __init__(self):
-        self.axioms = []  # Список для хранения аксиом
-        self.keywords = ['exit', 'help', 'axioms', 'axiom', 'prove', 'del']
+    def __init__(self, snapshot_path: str | None = None):
+        self.axioms = AxiomLibrary()  # Библиотека аксиом
+        self.snapshot_path = snapshot_path  # Снапшот, из которого загружается библиотека
+        self.keywords = KEYWORDS
 
-    def run(self):
-        expression_str = "A>(B>A)"
-        parser = Parser(expression_str, self.keywords)
-        expression = parser.parse()
-        self.axioms.append(expression)
+    def load_axioms(self):
+        """
+        Загружает библиотеку из снапшота, если он есть, иначе добавляет аксиомы Гильберта.
+
+        Формулы снапшота разбираются при первом обращении к библиотеке (см. check_axioms).
+        """
+        if self.snapshot_path is not None and os.path.exists(self.snapshot_path):
+            try:
+                self.axioms = AxiomLibrary.load(self.snapshot_path)
+                return
+            except (OSError, ValueError) as e:
+                self.snapshot_failed(e)
+                return
+
+        self.use_hilbert_axioms()
+
+    def use_hilbert_axioms(self):
+        """Заменяет библиотеку аксиомами Гильберта"""
+        self.axioms = AxiomLibrary()
+        for expression_str in HILBERT_AXIOMS:
+            parser = Parser(expression_str, self.keywords)
+            self.axioms.add(parser.parse())
+
+    def snapshot_failed(self, error: Exception):
+        """Сообщает об ошибке снапшота и переходит на аксиомы Гильберта"""
+        print(f"Не удалось загрузить снапшот {self.snapshot_path}: {error}")
+        print("Используются аксиомы Гильберта")
+        self.use_hilbert_axioms()
 
-        expression_str = "((A>(B>C))>((A>B)>(A>C)))"
-        parser = Parser(expression_str, self.keywords)
-        expression = parser.parse()
-        self.axioms.append(expression)
+    def check_axioms(self):
+        """Разбирает формулы загруженного снапшота; если он повреждён, переходит на аксиомы Гильберта"""
+        try:
+            self.axioms.materialize()
+        except ValueError as e:
+            self.snapshot_failed(e)
 
-        expression_str = "((!B>!A)>((!B>A)>B))"
-        parser = Parser(expression_str, self.keywords)
-        expression = parser.parse()
-        self.axioms.append(expression)
+    def run_command(self, command: str, argument: str) -> bool:
+        """
+        Выполняет команду работы с библиотекой аксиом.
+
+        Ошибки разбора аксиомы передаются вызывающему, ошибки самой команды выводятся здесь.
+        :return: True, если ввод был командой, иначе False.
+        """
+        self.check_axioms()
+        axiom = None
+        if command == "axiom" and argument != "":
+            parser = Parser(argument, self.keywords)
+            axiom = parser.parse()
+        try:
+            return self.execute_command(command, argument, axiom)
+        except (OSError, ValueError) as e:
+            print(f"Ошибка выполнения команды: {e}")
+            return True
+
+    def execute_command(self, command: str, argument: str, axiom: Expression | None) -> bool:
+        """
+        Выполняет команду над библиотекой аксиом.
+        :param axiom: Разобранная аксиома для команды axiom.
+        :return: True, если ввод был командой, иначе False.
+        """
+        if command == "axioms" and argument == "":
+            for axiom_id, formula in self.axioms.items():
+                print(f"{axiom_id}: {formula}")
+            return True
+        if command == "axiom" and argument != "":
+            axiom_id = self.axioms.find(axiom)
+            if axiom_id is not None:
+                print(f"Такая аксиома уже есть под номером {axiom_id}")
+            else:
+                axiom_id = self.axioms.add(axiom)
+                print(f"Аксиома добавлена под номером {axiom_id}")
+            return True
+        if command == "del" and argument != "":
+            if not argument.isdigit():
+                raise ValueError("Номер аксиомы должен быть числом")
+            formula = self.axioms.remove(int(argument))
+            print(f"Аксиома {formula} удалена")
+            return True
+        if command == "save":
+            path = argument if argument != "" else self.snapshot_path
+            if path is None:
+                raise ValueError("Не указан путь к снапшоту")
+            self.axioms.save(path)
+            print(f"Библиотека аксиом сохранена в {path}")
+            return True
+        return False
+
+    def run(self):
+        self.load_axioms()
 
         print("Введите выражение для его разбора")
 
@@ -36,6 +113,11 @@ class App:
                 if user_input == "quit":
                     break
 
+                command, _, argument = user_input.partition(' ')
+                if self.run_command(command, argument.strip()):
+                    print()
+                    continue
+
                 if len(parts) > 1:
                     expression_str = parts
                     parser = Parser(expression_str, self.keywords)
@@ -47,6 +129,7 @@ class App:
                     if result:
                         print(f"Выражение {expression} доказано")
                         print(f"Время разбора: {end_time - start_time} секунд")
+                        print(f"Леммы: {prover.lemmas}")
                         print()
                         continue
                     else:
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from typing import Optional
 
 
 class Expression(ABC):
@@ -176,31 +175,31 @@ class Variable(Expression):
 
 class ExpressionCast:
     @staticmethod
-    def as_negation(expr: Expression) -> Optional[Negation]:
+    def as_negation(expr: Expression) -> Negation | None:
         return expr if isinstance(expr, Negation) else None
 
     @staticmethod
-    def as_implication(expr: Expression) -> Optional[Implication]:
+    def as_implication(expr: Expression) -> Implication | None:
         return expr if isinstance(expr, Implication) else None
 
     @staticmethod
-    def as_variable(expr: Expression) -> Optional[Variable]:
+    def as_variable(expr: Expression) -> Variable | None:
         return expr if isinstance(expr, Variable) else None
 
     @staticmethod
-    def as_conjunction(expr: Expression) -> Optional[And]:
+    def as_conjunction(expr: Expression) -> And | None:
         return expr if isinstance(expr, And) else None
 
     @staticmethod
-    def as_disjunction(expr: Expression) -> Optional[Or]:
+    def as_disjunction(expr: Expression) -> Or | None:
         return expr if isinstance(expr, Or) else None
 
     @staticmethod
-    def as_xor(expr: Expression) -> Optional[Xor]:
+    def as_xor(expr: Expression) -> Xor | None:
         return expr if isinstance(expr, Xor) else None
 
     @staticmethod
-    def as_equivalence(expr: Expression) -> Optional[Equivalence]:
+    def as_equivalence(expr: Expression) -> Equivalence | None:
         return expr if isinstance(expr, Equivalence) else None
 
 
@@ -0,0 +1,67 @@
+import compileall
+import os
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+# Каталог с модулями проекта: в нём запускаются процессы сценариев
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Код пустого процесса, с которым сравниваются сценарии
+BASELINE = "pass"
+
+# Обёртка, которая замеряет время кода сценария внутри процесса и печатает его в миллисекундах
+TIMED = "from time import perf_counter\nstart_time = perf_counter()\n{code}\nprint((perf_counter() - start_time) * 1000)"
+
+# Сценарии запуска: название -> код, выполняемый в новом процессе интерпретатора
+SCENARIOS = {
+    'import Api': "import Api",
+    'Api.parse': "import Api; Api.parse('A>(B>A)')",
+    'Api.prove': "import Api; Api.prove('A>(B>A)')",
+    'import App': "import App",
+}
+
+
+def run_once(code: str) -> tuple[float, float]:
+    """
+    Запускает code в новом процессе интерпретатора.
+    :return: Время работы процесса и время самого code внутри процесса, в миллисекундах.
+    """
+    start_time = perf_counter()
+    result = subprocess.run([sys.executable, '-c', TIMED.format(code=code)], cwd=PROJECT_DIR,
+                            check=True, capture_output=True, text=True)
+    return (perf_counter() - start_time) * 1000, float(result.stdout.split()[-1])
+
+
+def measure(code: str, runs: int) -> tuple[float, float, float]:
+    """
+    Измеряет время процесса, выполняющего code, и время пустого процесса.
+
+    Пустой процесс запускается перед каждым запуском сценария, поэтому оба замера попадают
+    в одинаковые условия; первая пара — прогрев, она отбрасывается. Разность двух процессов
+    зашумлена на несколько миллисекунд, поэтому стоимость сценария берётся из замера внутри процесса.
+    :param code: Код для python -c.
+    :param runs: Количество пар запусков.
+    :return: Медианы времени процесса, пустого процесса и code внутри процесса, в миллисекундах.
+    """
+    run_once(BASELINE)
+    run_once(code)
+    totals = []
+    baselines = []
+    inner_times = []
+    for _ in range(runs):
+        baselines.append(run_once(BASELINE)[0])
+        total, inner = run_once(code)
+        totals.append(total)
+        inner_times.append(inner)
+    return median(totals), median(baselines), median(inner_times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # Байт-код должен быть актуален, иначе в замер попадёт компиляция (например, при PYTHONDONTWRITEBYTECODE)
+    compileall.compile_dir(PROJECT_DIR, maxlevels=0, quiet=1)
+    for name, code in SCENARIOS.items():
+        total, baseline, inner = measure(code, runs)
+        print(f"{name:15} {total:7.2f} мс (пустой процесс: {baseline:6.2f} мс, код сценария: {inner:6.2f} мс)")
@@ -0,0 +1,292 @@
+import mmap
+import os
+import struct
+from Utils import *
+
+
+# Аксиомы исчисления высказываний Гильберта — библиотека по умолчанию
+HILBERT_AXIOMS = ["A>(B>A)", "((A>(B>C))>((A>B)>(A>C)))", "((!B>!A)>((!B>A)>B))"]
+
+# Заголовок снапшота: сигнатура, версия формата, количество аксиом и следующий свободный номер
+SNAPSHOT_MAGIC = b'AXLB'
+SNAPSHOT_VERSION = 3
+SNAPSHOT_HEADER = struct.Struct('<4sIII')
+# Перед каждой формулой записаны номер аксиомы и признак тавтологии (0 или 1)
+SNAPSHOT_ENTRY = struct.Struct('<IB')
+# Наименьший размер записи аксиомы: номер, признак, тег переменной и длина её имени
+SNAPSHOT_MIN_ENTRY = SNAPSHOT_ENTRY.size + 2
+
+# Однобайтовые теги узлов в префиксной записи выражения
+TAG_VARIABLE = b'V'[0]
+TAG_NEGATION = b'!'[0]
+TAG_IMPLICATION = b'>'[0]
+TAG_AND = b'*'[0]
+TAG_OR = b'|'[0]
+TAG_XOR = b'+'[0]
+TAG_EQUIVALENCE = b'='[0]
+
+BINARY_TAGS = {
+    Implication: TAG_IMPLICATION,
+    And: TAG_AND,
+    Or: TAG_OR,
+    Xor: TAG_XOR,
+    Equivalence: TAG_EQUIVALENCE,
+}
+BINARY_CLASSES = {tag: cls for cls, tag in BINARY_TAGS.items()}
+
+
+def encode_expression(expression: Expression, buffer: bytearray):
+    """
+    Записывает выражение в буфер в префиксной форме.
+    :param expression: Выражение для записи.
+    :param buffer: Буфер, в который дописываются байты.
+    """
+    if isinstance(expression, Variable):
+        name = expression.name.encode('utf-8')
+        if len(name) > 255:
+            raise ValueError(f"Слишком длинное имя переменной: {expression.name}")
+        buffer.append(TAG_VARIABLE)
+        buffer.append(len(name))
+        buffer.extend(name)
+    elif isinstance(expression, Negation):
+        buffer.append(TAG_NEGATION)
+        encode_expression(expression.expr, buffer)
+    elif type(expression) in BINARY_TAGS:
+        buffer.append(BINARY_TAGS[type(expression)])
+        encode_expression(expression.left, buffer)
+        encode_expression(expression.right, buffer)
+    else:
+        raise ValueError(f"Неизвестный тип выражения: {expression}")
+
+
+def decode_expression(data, pos: int) -> tuple[Expression, int]:
+    """
+    Читает выражение в префиксной форме.
+    :param data: Байты (или mmap) с записью выражения.
+    :param pos: Позиция начала записи.
+    :return: Выражение и позиция сразу за ним.
+    """
+    tag = data[pos]
+    pos += 1
+    if tag == TAG_VARIABLE:
+        length = data[pos]
+        if pos + 1 + length > len(data):
+            raise ValueError("Повреждённый снапшот: неожиданный конец файла")
+        name = bytes(data[pos + 1:pos + 1 + length]).decode('utf-8')
+        return Variable(name), pos + 1 + length
+    if tag == TAG_NEGATION:
+        expr, pos = decode_expression(data, pos)
+        return Negation(expr), pos
+    if tag in BINARY_CLASSES:
+        left, pos = decode_expression(data, pos)
+        right, pos = decode_expression(data, pos)
+        return BINARY_CLASSES[tag](left, right), pos
+    raise ValueError(f"Повреждённый снапшот: неизвестный тег {tag}")
+
+
+class AxiomLibrary:
+    def __init__(self):
+        """
+        Библиотека аксиом.
+
+        Каждая аксиома приводится к импликативной форме и упрощается один раз — при добавлении,
+        поэтому Prover получает уже готовые условия.
+        """
+        self.formulas: dict[int, Expression] = {}  # Номер аксиомы -> нормализованная формула
+        self.ids: dict[Expression, int] = {}  # Нормализованная формула -> номер (для исключения дублей)
+        self.by_type: dict[type, dict[int, None]] = {}  # Тип корня формулы -> номера аксиом
+        self.tautologies: dict[int, bool] = {}  # Номер аксиомы -> является ли она тавтологией
+        self.next_id = 1
+        self.order: tuple[Expression, ...] | None = None  # Кэш условий в порядке добавления
+        self.positions: dict[int, int] | None = None  # Кэш номер аксиомы -> позиция в order
+        self.fixed: frozenset | None = None  # Кэш переменных аксиом, не являющихся тавтологиями
+        self.snapshot: mmap.mmap | None = None  # Загруженный, но ещё не разобранный снапшот
+        self.snapshot_count = 0
+
+    def add(self, axiom: Expression) -> int:
+        """
+        Добавляет аксиому в библиотеку.
+        :param axiom: Аксиома в исходной форме.
+        :return: Номер аксиомы (для уже имеющейся аксиомы — её прежний номер).
+        """
+        return self.add_normalized(simplify(axiom.to_implication_form()))
+
+    def add_normalized(self, formula: Expression) -> int:
+        """Добавляет уже нормализованную формулу, обновляя индексы"""
+        self.materialize()
+        if formula in self.ids:
+            return self.ids[formula]
+        axiom_id = self.next_id
+        self.next_id += 1
+        self.insert(axiom_id, formula)
+        return axiom_id
+
+    def insert(self, axiom_id: int, formula: Expression, tautology: bool | None = None):
+        """
+        Записывает нормализованную формулу под заданным номером и обновляет индексы.
+        :param tautology: Является ли формула тавтологией; если неизвестно, проверяется доказательством.
+        """
+        if tautology is None:
+            from Prover import is_tautology  # Prover импортирует Library, поэтому импорт отложен
+            tautology = is_tautology(formula)
+        self.formulas[axiom_id] = formula
+        self.ids[formula] = axiom_id
+        self.by_type.setdefault(type(formula), {})[axiom_id] = None
+        self.tautologies[axiom_id] = tautology
+        self.order = None
+        self.positions = None
+        self.fixed = None
+
+    def find(self, axiom: Expression) -> int | None:
+        """
+        Ищет аксиому в библиотеке.
+        :param axiom: Аксиома в исходной форме.
+        :return: Номер аксиомы или None, если её нет.
+        """
+        self.materialize()
+        return self.ids.get(simplify(axiom.to_implication_form()))
+
+    def remove(self, axiom_id: int) -> Expression:
+        """
+        Удаляет аксиому из библиотеки.
+        :param axiom_id: Номер аксиомы.
+        :return: Удалённая нормализованная формула.
+        """
+        self.materialize()
+        if axiom_id not in self.formulas:
+            raise ValueError(f"Аксиомы с номером {axiom_id} нет")
+        formula = self.formulas.pop(axiom_id)
+        del self.ids[formula]
+        del self.by_type[type(formula)][axiom_id]
+        del self.tautologies[axiom_id]
+        self.order = None
+        self.positions = None
+        self.fixed = None
+        return formula
+
+    def items(self) -> list[tuple[int, Expression]]:
+        """Пары (номер, нормализованная формула) в порядке добавления"""
+        self.materialize()
+        return list(self.formulas.items())
+
+    def conditions(self) -> list[Expression]:
+        """Копия списка нормализованных аксиом для Prover"""
+        self.materialize()
+        if self.order is None:
+            self.order = tuple(self.formulas.values())
+        return list(self.order)
+
+    def candidates(self, target: Expression) -> list[int]:
+        """
+        Позиции (в списке conditions()) аксиом, которые могут унифицироваться с целью.
+
+        unify сопоставляет только выражения с одинаковым типом корня,
+        поэтому достаточно взять аксиомы из индекса по типу.
+        """
+        self.materialize()
+        if self.positions is None:
+            self.positions = {axiom_id: i for i, axiom_id in enumerate(self.formulas)}
+        return [self.positions[axiom_id] for axiom_id in self.by_type.get(type(target), {})]
+
+    def fixed_names(self) -> frozenset:
+        """
+        Имена переменных аксиом, не являющихся тавтологиями.
+
+        Подстановка в тавтологию тоже даёт тавтологию, поэтому только переменные остальных аксиом
+        отличают одно выражение от его переименований (см. prove_many).
+        """
+        self.materialize()
+        if self.fixed is None:
+            fixed = set()
+            for axiom_id, formula in self.formulas.items():
+                if not self.tautologies[axiom_id]:
+                    fixed |= variable_names(formula)
+            self.fixed = frozenset(fixed)
+        return self.fixed
+
+    def __len__(self):
+        if self.snapshot is not None:
+            return self.snapshot_count
+        return len(self.formulas)
+
+    def save(self, path: str):
+        """
+        Сохраняет нормализованные аксиомы в бинарный снапшот.
+
+        Формат: заголовок (сигнатура, версия, количество, следующий номер), затем для каждой аксиомы
+        её номер, признак тавтологии и формула в префиксной записи.
+        """
+        self.materialize()
+        buffer = bytearray(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.formulas), self.next_id))
+        for axiom_id, formula in self.formulas.items():
+            buffer.extend(SNAPSHOT_ENTRY.pack(axiom_id, self.tautologies[axiom_id]))
+            encode_expression(formula, buffer)
+        with open(path, 'wb') as file:
+            file.write(buffer)
+
+    @staticmethod
+    def load(path: str) -> 'AxiomLibrary':
+        """
+        Открывает снапшот через mmap.
+
+        При загрузке проверяются только заголовок и соответствие количества аксиом размеру файла,
+        формулы разбираются при первом обращении к библиотеке, поэтому время загрузки не зависит от её размера.
+        Ошибки в самих формулах обнаруживаются при разборе (см. materialize).
+        """
+        library = AxiomLibrary()
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size < SNAPSHOT_HEADER.size:
+                raise ValueError("Повреждённый снапшот: нет заголовка")  # Пустой файл mmap не отобразит
+            snapshot = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, next_id = SNAPSHOT_HEADER.unpack_from(snapshot, 0)
+        error = None
+        if magic != SNAPSHOT_MAGIC:
+            error = "Файл не является снапшотом библиотеки аксиом"
+        elif version != SNAPSHOT_VERSION:
+            error = f"Неподдерживаемая версия снапшота: {version}"
+        elif count >= next_id:
+            error = f"Повреждённый снапшот: {count} аксиом при следующем номере {next_id}"  # Номера различны и меньше next_id
+        elif count * SNAPSHOT_MIN_ENTRY > size - SNAPSHOT_HEADER.size:
+            error = f"Повреждённый снапшот: файл слишком короткий для {count} аксиом"
+        if error is not None:
+            snapshot.close()
+            raise ValueError(error)
+        library.snapshot = snapshot
+        library.snapshot_count = count
+        library.next_id = next_id
+        return library
+
+    def materialize(self):
+        """
+        Разбирает формулы из загруженного снапшота, если он ещё не разобран.
+
+        Библиотека заполняется только после успешного разбора всего снапшота;
+        при ошибке она остаётся нетронутой, и ошибка повторится при следующем обращении.
+        """
+        if self.snapshot is None:
+            return
+        snapshot = self.snapshot
+        entries = {}  # Формула -> (номер аксиомы, признак тавтологии)
+        seen = set()  # Уже прочитанные номера аксиом
+        pos = SNAPSHOT_HEADER.size
+        try:
+            for _ in range(self.snapshot_count):
+                axiom_id, tautology = SNAPSHOT_ENTRY.unpack_from(snapshot, pos)
+                formula, pos = decode_expression(snapshot, pos + SNAPSHOT_ENTRY.size)
+                if axiom_id in seen or axiom_id == 0 or axiom_id >= self.next_id:
+                    raise ValueError(f"Повреждённый снапшот: некорректный номер аксиомы {axiom_id}")
+                if tautology > 1:
+                    raise ValueError(f"Повреждённый снапшот: некорректный признак тавтологии у аксиомы {axiom_id}")
+                if formula in entries:
+                    raise ValueError(f"Повреждённый снапшот: аксиома {formula} записана под номерами "
+                                     f"{entries[formula][0]} и {axiom_id}")
+                seen.add(axiom_id)
+                entries[formula] = (axiom_id, tautology == 1)
+        except (IndexError, struct.error):
+            raise ValueError("Повреждённый снапшот: неожиданный конец файла")
+        self.snapshot = None
+        self.snapshot_count = 0
+        snapshot.close()
+        for formula, (axiom_id, tautology) in entries.items():
+            self.insert(axiom_id, formula, tautology)
@@ -1,14 +1,17 @@
-from typing import List
 from Architect import *
 
 
+# Служебные слова, которые нельзя использовать как имена переменных
+KEYWORDS = ['exit', 'help', 'axioms', 'axiom', 'prove', 'del', 'save']
+
+
 class Parser:
-    def __init__(self, expression: str, keywords: List):
+    def __init__(self, expression: str, keywords: list):
         self.keywords = keywords
         self.tokens = self.tokenize(expression)
         self.pos = 0
 
-    def tokenize(self, expression: str) -> List[str]:
+    def tokenize(self, expression: str) -> list[str]:
         tokens = []
         i = 0
         while i < len(expression):
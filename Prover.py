@@ -1,74 +1,92 @@
 from Utils import *
-from typing import List
+from Library import AxiomLibrary
 
 
 class Prover:
-    def __init__(self, axioms: List[Expression], target: Expression):
-        self.axioms = [simplify(axiom.to_implication_form()) for axiom in axioms]  # Список для хранения аксиом
-        self.conditions = self.axioms  # Условия
+    def __init__(self, axioms: list[Expression] | AxiomLibrary, target: Expression, lemmas: LemmaTable | None = None,
+                 log=print):
+        candidates = None
+        self.log = log  # Функция вывода хода доказательства (None — не выводить)
         self.target = simplify(target.to_implication_form())  # Цель доказательства
+        if isinstance(axioms, AxiomLibrary):
+            # Аксиомы библиотеки уже нормализованы, унифицируем только подходящие по типу корня
+            self.axioms = axioms.conditions()
+            candidates = axioms.candidates(self.target)
+        else:
+            self.axioms = [simplify(axiom.to_implication_form()) for axiom in axioms]  # Список для хранения аксиом
+        self.conditions = self.axioms  # Условия
         self.to_prove = self.target  # Цель доказательства для обработки
         self.sequent = None
-        self.preprocessing()
+        self.lemmas = lemmas if lemmas is not None else LemmaTable()  # Леммы, можно разделять между доказательствами
+        self.preprocessing(candidates)
 
-    def preprocessing(self):
-        self.unification()
+    def preprocessing(self, candidates=None):
+        self.unification(candidates)
         self.sequent = Sequent({condition: 0 for condition in self.conditions},
                                {self.to_prove: 0},
-                               0)
+                               0,
+                               self.lemmas.index)
 
-    def unification(self):
-        for i in range(len(self.conditions)):
+    def unification(self, candidates=None):
+        if candidates is None:
+            candidates = range(len(self.conditions))
+        for i in candidates:
             substitutions = unify(self.conditions[i], self.to_prove, None)
             if substitutions is not None:
-                print(f"Замены при унификации: {', '.join(f'{k}: {v}' for k, v in substitutions.items())}")
+                self.trace("Замены при унификации: {}", ', '.join(f'{k}: {v}' for k, v in substitutions.items()))
                 self.conditions[i] = apply_substitutions(self.conditions[i], substitutions)
 
+    def trace(self, template: str, *args):
+        """Выводит сообщение о ходе доказательства; форматирует его, только если вывод включён"""
+        if self.log is not None:
+            self.log(template.format(*args))
+
     def print_proof_tree(self, sequent, depth=0):
         """Выводит дерево доказательства в удобном формате."""
-        print(f"Глубина: {sequent.depth}. Секвент: {sequent}")
+        self.trace("Глубина: {}. Секвент: {}", sequent.depth, sequent)
 
     def prove(self):
         """Доказательство строится на основе создания дерева секвентов"""
         if self.sequent is None:
             return False
-        # Списки для хранения секвенций, которые нужно проверить и те, что уже доказаны
         frontier = [self.sequent]  # Секвенты для проверки
-        proven = {self.sequent}  # Секвенты, которые уже доказаны
+        waiting = {}  # Ключ разбираемого секвента -> такие же секвенты из других ветвей, ждущие его доказательства
 
-        while True:
-            # Получаем следующий секвент из списка для проверки
-            old_sequent = None
-            while len(frontier) > 0 and (old_sequent is None or old_sequent in proven):
-                old_sequent = frontier.pop(0)  # Извлекаем первый секвент
-            if old_sequent is None:
-                break  # Если больше нет секвентов для проверки, выходим из цикла
+        while len(frontier) > 0:
+            old_sequent = frontier.pop(0)  # Извлекаем первый секвент
 
             # Выводим информацию о текущем секвенте в виде дерева
             self.print_proof_tree(old_sequent, old_sequent.depth)
 
             # Проверяем, является ли секвент аксиоматически истинным без унификации
-            if len(set(old_sequent.left.keys()) & set(old_sequent.right.keys())) > 0:
-                proven.add(old_sequent)
+            if old_sequent.left.bits & old_sequent.right.bits:
+                self.close(old_sequent, waiting)
+                continue
+
+            # Такой же секвент уже разбирается в другой ветви — дожидаемся его результата
+            key = old_sequent.key()
+            if key in waiting:
+                self.lemmas.hits += 1
+                self.trace("Секвент уже разбирается в другой ветви")
+                waiting[key].append(old_sequent)
+                continue
+
+            # Проверяем, не доказан или опровергнут ли секвент (или более сильный) ранее
+            lemma = self.lemmas.lookup(key)
+            if lemma is True:
+                self.trace("Секвент следует из доказанной леммы")
+                self.close(old_sequent, waiting)
                 continue
+            if lemma is False:
+                self.trace("Секвент следует из опровергнутой леммы")
+                self.refute(old_sequent)
+                return False
+            waiting[key] = []
 
             while True:
                 # Определим, с какой формулой будем работать
-                left_expression = None
-                left_depth = None
-                for expression, depth in old_sequent.left.items():
-                    if left_depth is None or left_depth > depth:
-                        if not isinstance(expression, Variable):
-                            left_expression = expression
-                            left_depth = depth
-
-                right_expression = None
-                right_depth = None
-                for expression, depth in old_sequent.right.items():
-                    if right_depth is None or right_depth > depth:
-                        if not isinstance(expression, Variable):
-                            right_expression = expression
-                            right_depth = depth
+                left_expression, left_depth = old_sequent.left.principal()
+                right_expression, right_depth = old_sequent.right.principal()
 
                 # Определяем, с какой частью секвента будем работать
                 apply_left = False
@@ -83,33 +101,98 @@ class Prover:
                     else:
                         apply_right = True
                 if left_expression is None and right_expression is None:
+                    self.refute(old_sequent)
                     return False  # Если формул нет, не можем доказать
 
                 # Применение левого правила
                 if apply_left:
                     if isinstance(left_expression, Negation):
-                        print(f"Перебрасываем левую часть {left_expression} в правую:")
-                        new_sequent = remove_left_negation(old_sequent, left_expression)
-                        frontier.append(new_sequent)  # Добавляем новый секвент в frontier
+                        self.trace("Перебрасываем левую часть {} в правую:", left_expression)
+                        new_sequents = [remove_left_negation(old_sequent, left_expression)]
                         break
                     if isinstance(left_expression, Implication):
-                        print(f"Применение modus ponens к выражению {left_expression}:")
+                        self.trace("Применение modus ponens к выражению {}:", left_expression)
                         new_sequents = modus_ponens(old_sequent, left_expression)
-                        frontier.extend(new_sequents)  # Добавляем новые секвенты в frontier
                         break
 
                 # Применение правого правила
                 if apply_right:
                     if isinstance(right_expression, Negation):
-                        print(f"Перебрасываем правую часть {right_expression} в левую:")
-                        new_sequent = remove_right_negation(old_sequent, right_expression)
-                        frontier.append(new_sequent)  # Добавляем новый секвент в frontier
+                        self.trace("Перебрасываем правую часть {} в левую:", right_expression)
+                        new_sequents = [remove_right_negation(old_sequent, right_expression)]
                         break
                     if isinstance(right_expression, Implication):
-                        print(f"Применяем теорему о дедукции к выражению {right_expression}:")
-                        new_sequent = deduction(old_sequent, right_expression)
-                        frontier.append(new_sequent)  # Добавляем новый секвент в frontier
+                        self.trace("Применяем теорему о дедукции к выражению {}:", right_expression)
+                        new_sequents = [deduction(old_sequent, right_expression)]
                         break
 
+            # Связываем новые секвенты с исходным, чтобы записать его в леммы, когда они будут доказаны
+            for new_sequent in new_sequents:
+                new_sequent.parent = old_sequent
+            old_sequent.pending = len(new_sequents)
+            frontier.extend(new_sequents)  # Добавляем новые секвенты в frontier
+
         # Если больше нет секвентов для доказательства, возвращаем True
         return True
+
+    def close(self, sequent, waiting):
+        """
+        Отмечает секвент доказанным и записывает в леммы его и все секвенты,
+        доказательство которых от этого завершилось.
+        """
+        stack = [sequent]
+        while len(stack) > 0:
+            current = stack.pop()
+            key = current.key()
+            self.lemmas.add_proved(key)
+            stack.extend(waiting.pop(key, []))  # Ожидавшие этот секвент в других ветвях тоже доказаны
+            parent = current.parent
+            if parent is not None:
+                parent.pending -= 1
+                if parent.pending == 0:
+                    stack.append(parent)
+
+    def refute(self, sequent):
+        """Записывает в леммы опровергнутый секвент и его предков: все правила обратимы"""
+        while sequent is not None:
+            self.lemmas.add_refuted(sequent.key())
+            sequent = sequent.parent
+
+
+def is_tautology(formula: Expression) -> bool:
+    """Доказуема ли формула без аксиом"""
+    return Prover([], formula, log=None).prove()
+
+
+def prove_many(axioms: list[Expression] | AxiomLibrary, targets: list[Expression], commutative: bool = False,
+               log=print) -> list[bool]:
+    """
+    Доказывает набор выражений, запуская Prover один раз на каждый класс эквивалентности.
+
+    Выражения с одинаковым отпечатком (см. fingerprint) отличаются лишь именами переменных
+    или порядком операндов коммутативных операций. Если аксиома — тавтология (как аксиомы Гильберта),
+    она и все её подстановочные варианты не влияют на доказуемость, и такое различие несущественно.
+    Переменные остальных аксиом в отпечатке не переименовываются, а перестановка операндов
+    в этом случае не учитывается: унификация с аксиомой чувствительна к порядку операндов.
+    :param axioms: Аксиомы или библиотека аксиом.
+    :param targets: Выражения для доказательства.
+    :param commutative: Объединять ли выражения, отличающиеся порядком операндов ∧, ∨, +, =.
+    :param log: Функция вывода хода доказательства (None — не выводить).
+    :return: Результаты доказательства в порядке targets.
+    """
+    if isinstance(axioms, AxiomLibrary):
+        fixed = axioms.fixed_names()  # Признаки тавтологий вычислены при добавлении аксиом
+    else:
+        fixed = set()  # Переменные аксиом, не являющихся тавтологиями
+        for axiom in axioms:
+            if not is_tautology(axiom):
+                fixed |= variable_names(axiom)
+    if fixed:
+        commutative = False
+    keys = [fingerprint(target, commutative, fixed) for target in targets]
+    results: dict[str, bool] = {}
+    lemmas = LemmaTable()  # Секвенты содержат все условия, поэтому леммы верны и для других целей
+    for key, target in zip(keys, targets):
+        if key not in results:
+            results[key] = Prover(axioms, target, lemmas, log).prove()
+    return [results[key] for key in keys]
@@ -1,18 +1,141 @@
+import heapq
 from Architect import *
 
 
+class FormulaIndex:
+    def __init__(self):
+        """
+        Общая для всех секвентов одного доказательства нумерация формул.
+
+        Каждой формуле сопоставляется свой бит, поэтому множество формул части секвента
+        хранится как целое число, а пересечение частей проверяется одной операцией &.
+        """
+        self.bits = {}  # Формула -> её бит
+        self.next_order = 0  # Счётчик порядка добавления формул в части секвентов
+
+    def bit(self, expression: Expression) -> int:
+        """Возвращает бит формулы, выдавая новый при первом обращении"""
+        bit = self.bits.get(expression)
+        if bit is None:
+            bit = 1 << len(self.bits)
+            self.bits[expression] = bit
+        return bit
+
+
+class SequentSide:
+    def __init__(self, index: FormulaIndex, formulas: dict | None = None):
+        """
+        Часть секвента: формулы с глубинами.
+
+        Кроме глубины для каждой формулы хранится номер добавления (порядок, в котором формулы
+        перебирал бы словарь) и её бит. Поддерживаются битовое множество формул и куча составных
+        формул по (глубине, номеру добавления). Правила удаляют только главную формулу — вершину кучи,
+        поэтому устаревшие записи появляются лишь при смене глубины уже имеющейся формулы.
+        :param index: Общая нумерация формул.
+        :param formulas: Начальные формулы с глубинами.
+        """
+        self.index = index
+        self.entries = {}  # Формула -> (глубина, номер добавления, бит)
+        self.bits = 0  # Битовое множество формул части
+        self.heap = []  # Куча (глубина, номер добавления, формула) составных формул
+        self.stale = 0  # Количество устаревших записей в куче
+        if formulas is not None:
+            for expression, depth in formulas.items():
+                self[expression] = depth
+
+    def __contains__(self, expression: Expression) -> bool:
+        return expression in self.entries
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, expression: Expression) -> int:
+        return self.entries[expression][0]
+
+    def __setitem__(self, expression: Expression, depth: int):
+        entry = self.entries.get(expression)
+        compound = not isinstance(expression, Variable)
+        if entry is None:
+            order = self.index.next_order
+            self.index.next_order += 1
+            bit = self.index.bit(expression)
+            self.bits |= bit
+        else:
+            if entry[0] == depth:
+                return
+            order, bit = entry[1], entry[2]  # Формула сохраняет своё место в порядке добавления
+            if compound:
+                self.stale += 1
+        self.entries[expression] = (depth, order, bit)
+        if compound:
+            heapq.heappush(self.heap, (depth, order, expression))
+
+    def __delitem__(self, expression: Expression):
+        depth, order, bit = self.entries.pop(expression)
+        self.bits &= ~bit
+        if isinstance(expression, Variable):
+            return
+        if len(self.heap) > 0 and self.heap[0][0] == depth and self.heap[0][1] == order:
+            heapq.heappop(self.heap)
+        else:
+            self.stale += 1
+
+    def copy(self) -> 'SequentSide':
+        if self.stale * 2 > len(self.heap):
+            self.compact()
+        side = SequentSide(self.index)
+        side.entries = self.entries.copy()
+        side.bits = self.bits
+        side.heap = self.heap.copy()
+        side.stale = self.stale
+        return side
+
+    def compact(self):
+        """Перестраивает кучу без устаревших записей"""
+        self.heap = [(depth, order, expression) for expression, (depth, order, _) in self.entries.items()
+                     if not isinstance(expression, Variable)]
+        heapq.heapify(self.heap)
+        self.stale = 0
+
+    def principal(self):
+        """
+        Составная формула наименьшей глубины (при равенстве — добавленная раньше).
+        :return: Пара (формула, глубина) или (None, None), если составных формул нет.
+        """
+        while len(self.heap) > 0:
+            depth, order, expression = self.heap[0]
+            if self.stale == 0:
+                return expression, depth
+            entry = self.entries.get(expression)
+            if entry is not None and entry[0] == depth and entry[1] == order:
+                return expression, depth
+            heapq.heappop(self.heap)  # Формула удалена или её глубина изменилась
+            self.stale -= 1
+        return None, None
+
+
 class Sequent:
-    def __init__(self, left: dict, right: dict, depth: int):
+    def __init__(self, left: dict, right: dict, depth: int, index: FormulaIndex | None = None):
         """
         Инициализация секвента.
 
         :param left: Левые формулы секвента (обычно предпосылки).
         :param right: Правые формулы секвента (обычно вывод).
         :param depth: Глубина секвента в дереве доказательства.
+        :param index: Нумерация формул, если left и right — обычные словари (по умолчанию новая).
         """
+        if not isinstance(left, SequentSide) or not isinstance(right, SequentSide):
+            index = index if index is not None else FormulaIndex()
+            left = SequentSide(index, left)
+            right = SequentSide(index, right)
         self.left = left  # Хранит формулы слева от знака вывода
         self.right = right  # Хранит формулы справа от знака вывода
         self.depth = depth  # Глубина текущего секвента
+        self.parent = None  # Секвент, из которого получен текущий
+        self.pending = 0  # Количество ещё не доказанных секвентов, полученных из текущего
 
     def __eq__(self, other):
         """
@@ -59,6 +182,125 @@ class Sequent:
         """
         return hash(str(self))  # Возвращаем хэш на основе строкового представления
 
+    def key(self):
+        """
+        Канонический ключ секвента: битовые множества формул слева и справа.
+
+        Глубины формул влияют только на порядок применения правил, но не на доказуемость,
+        поэтому в ключ не входят.
+        """
+        return self.left.bits, self.right.bits
+
+
+# Сколько последних лемм из списка опорной формулы проверяется на поглощение при одном поиске
+SUBSUMPTION_CANDIDATES = 16
+
+
+def bit_positions(bits: int):
+    """Перечисляет номера единичных битов числа"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class LemmaTable:
+    def __init__(self):
+        """
+        Таблица лемм — уже доказанных и опровергнутых секвентов.
+
+        Секвент Γ ⊢ Δ доказуем, если доказан секвент Γ' ⊢ Δ' с Γ' ⊆ Γ и Δ' ⊆ Δ (ослабление),
+        и опровергнут, если опровергнут секвент Γ'' ⊢ Δ'' с Γ ⊆ Γ'' и Δ ⊆ Δ''.
+        Ключи — пары битовых множеств (Sequent.key()) в общей нумерации формул index,
+        поэтому проверка вложения — пара битовых операций.
+        Для поиска по поглощению доказанная лемма кладётся в список самой редкой своей формулы,
+        опровергнутая (они редки: одна цепочка на неудачное доказательство) — в списки всех своих формул.
+        Из каждого списка проверяются только SUBSUMPTION_CANDIDATES последних лемм.
+        """
+        self.index = FormulaIndex()  # Нумерация формул для всех секвентов, использующих таблицу
+        self.proved = set()  # Ключи доказанных секвентов
+        self.refuted = set()  # Ключи опровергнутых секвентов
+        self.proved_index = {}  # Опорная формула -> доказанные ключи
+        self.refuted_index = {}  # Формула -> опровергнутые ключи, содержащие её
+        self.proved_anchors = (0, 0)  # Битовые множества опорных формул доказанных лемм слева и справа
+        self.refuted_formulas = (0, 0)  # Битовые множества формул опровергнутых лемм слева и справа
+        self.hits = 0  # Ответы из таблицы
+        self.subsumed = 0  # Из них ответы по поглощению, а не по точному совпадению
+        self.misses = 0  # Секвенты, которые пришлось разбирать
+
+    @staticmethod
+    def anchors(key):
+        """Опорные формулы ключа: 2 * номер бита для левой части, 2 * номер бита + 1 для правой"""
+        left, right = key
+        return [2 * bit for bit in bit_positions(left)] + [2 * bit + 1 for bit in bit_positions(right)]
+
+    def add_proved(self, key):
+        """Запоминает доказанный секвент"""
+        if key in self.proved:
+            return
+        self.proved.add(key)
+        left, right = key
+        if left & right:
+            return  # Аксиоматически истинные секвенты и так закрываются сразу, в индекс их не кладём
+        anchor = min(self.anchors(key), key=lambda anchor: len(self.proved_index.get(anchor, ())), default=None)
+        if anchor is None:
+            return
+        self.proved_index.setdefault(anchor, []).append(key)
+        anchors_left, anchors_right = self.proved_anchors
+        if anchor % 2 == 0:
+            self.proved_anchors = (anchors_left | 1 << anchor // 2, anchors_right)
+        else:
+            self.proved_anchors = (anchors_left, anchors_right | 1 << anchor // 2)
+
+    def add_refuted(self, key):
+        """Запоминает опровергнутый секвент"""
+        if key in self.refuted:
+            return
+        self.refuted.add(key)
+        for anchor in self.anchors(key):
+            self.refuted_index.setdefault(anchor, []).append(key)
+        left, right = key
+        formulas_left, formulas_right = self.refuted_formulas
+        self.refuted_formulas = (formulas_left | left, formulas_right | right)
+
+    def lookup(self, key):
+        """
+        Ищет ответ для секвента в таблице.
+        :param key: Ключ секвента (Sequent.key()).
+        :return: True — доказан, False — опровергнут, None — ответа нет.
+        """
+        if key in self.proved:
+            self.hits += 1
+            return True
+        if key in self.refuted:
+            self.hits += 1
+            return False
+        left, right = key
+        # Доказанная лемма вкладывается в секвент, поэтому её опорная формула есть среди формул секвента;
+        # смотрим только формулы секвента, под которыми есть леммы
+        anchors_left, anchors_right = self.proved_anchors
+        if left & anchors_left or right & anchors_right:
+            for anchor in self.anchors((left & anchors_left, right & anchors_right)):
+                for lemma_left, lemma_right in self.proved_index.get(anchor, ())[-SUBSUMPTION_CANDIDATES:]:
+                    if lemma_left & ~left == 0 and lemma_right & ~right == 0:
+                        self.hits += 1
+                        self.subsumed += 1
+                        return True
+        # Опровергнутая лемма содержит все формулы секвента — берём самый короткий из их списков
+        formulas_left, formulas_right = self.refuted_formulas
+        if (left or right) and left & ~formulas_left == 0 and right & ~formulas_right == 0:
+            candidates = min((self.refuted_index.get(anchor, ()) for anchor in self.anchors(key)), key=len)
+            for lemma_left, lemma_right in candidates[-SUBSUMPTION_CANDIDATES:]:
+                if left & ~lemma_left == 0 and right & ~lemma_right == 0:
+                    self.hits += 1
+                    self.subsumed += 1
+                    return False
+        self.misses += 1
+        return None
+
+    def __str__(self):
+        return f"попаданий: {self.hits} (по поглощению: {self.subsumed}), промахов: {self.misses}"
+
 
 def deduction(sequent, expression):
     """
@@ -241,6 +483,104 @@ def apply_substitutions(expr: Expression, substitutions: dict) -> Expression:
         return expr
 
 
+# Обозначения операций в отпечатке и типы с перестановочными операндами
+FINGERPRINT_SYMBOLS = {Negation: '!', Implication: '>', And: '*', Or: '|', Xor: '+', Equivalence: '='}
+COMMUTATIVE_TYPES = (And, Or, Xor, Equivalence)
+
+
+def fingerprint(expression: Expression, commutative: bool = False, fixed=frozenset()) -> str:
+    """
+    Канонический отпечаток выражения, не зависящий от имён переменных.
+
+    Переменные нумеруются в порядке первого появления, поэтому A>(B>A) и C>(D>C) дают
+    один и тот же отпечаток (x0>(x1>x0)). При commutative=True операнды ∧, ∨, + и =
+    упорядочиваются по хэшу формы поддерева (без учёта имён переменных).
+    Совпадение отпечатков гарантирует, что выражения совпадают с точностью до переименования
+    (и перестановки операндов); обратное при совпадении хэшей форм может не выполняться.
+    Хэш формы детерминирован, поэтому отпечатки совпадают в разных процессах.
+    :param expression: Выражение.
+    :param commutative: Учитывать ли перестановочность операндов.
+    :param fixed: Имена переменных, которые не переименовываются (например, переменные аксиом).
+    :return: Строка-отпечаток. Строится за один линейный обход выражения,
+             при commutative=True — за два (сначала вычисляются хэши форм).
+    """
+    shapes = {}
+    if commutative:
+        shape_hash(expression, shapes)
+    tokens = []
+    write_fingerprint(expression, shapes, {}, fixed, tokens)
+    return ''.join(tokens)
+
+
+def variable_names(expression: Expression) -> set:
+    """Возвращает множество имён переменных выражения"""
+    if isinstance(expression, Variable):
+        return {expression.name}
+    if isinstance(expression, Negation):
+        return variable_names(expression.expr)
+    return variable_names(expression.left) | variable_names(expression.right)
+
+
+# Параметры детерминированного хэша форм (встроенный hash() зависит от PYTHONHASHSEED)
+SHAPE_MULTIPLIER = 1000003
+SHAPE_MASK = (1 << 64) - 1
+
+
+def mix_shape(symbol: str, *parts: int) -> int:
+    """Смешивает символ операции и хэши операндов в 64-битный хэш"""
+    result = ord(symbol)
+    for part in parts:
+        result = ((result * SHAPE_MULTIPLIER) ^ part) & SHAPE_MASK
+    return result
+
+
+def shape_hash(expression: Expression, shapes: dict) -> int:
+    """
+    Вычисляет хэш формы поддерева без учёта имён переменных.
+    :param shapes: Словарь id(узла) -> хэш формы, заполняется для всех узлов.
+    """
+    if isinstance(expression, Variable):
+        result = 0
+    elif isinstance(expression, Negation):
+        result = mix_shape('!', shape_hash(expression.expr, shapes))
+    else:
+        left = shape_hash(expression.left, shapes)
+        right = shape_hash(expression.right, shapes)
+        if isinstance(expression, COMMUTATIVE_TYPES) and right < left:
+            left, right = right, left
+        result = mix_shape(FINGERPRINT_SYMBOLS[type(expression)], left, right)
+    shapes[id(expression)] = result
+    return result
+
+
+def write_fingerprint(expression: Expression, shapes: dict, names: dict, fixed, tokens: list):
+    """
+    Записывает отпечаток выражения в tokens.
+    :param shapes: Хэши форм поддеревьев (пустой словарь — операнды не переставляются).
+    :param names: Уже занумерованные переменные.
+    :param fixed: Имена переменных, которые записываются как есть.
+    """
+    if isinstance(expression, Variable):
+        if expression.name in fixed:
+            tokens.append(f"'{expression.name}'")
+            return
+        if expression.name not in names:
+            names[expression.name] = len(names)
+        tokens.append(f"x{names[expression.name]}")
+    elif isinstance(expression, Negation):
+        tokens.append('!')
+        write_fingerprint(expression.expr, shapes, names, fixed, tokens)
+    else:
+        left, right = expression.left, expression.right
+        if shapes and isinstance(expression, COMMUTATIVE_TYPES) and shapes[id(right)] < shapes[id(left)]:
+            left, right = right, left
+        tokens.append('(')
+        write_fingerprint(left, shapes, names, fixed, tokens)
+        tokens.append(FINGERPRINT_SYMBOLS[type(expression)])
+        write_fingerprint(right, shapes, names, fixed, tokens)
+        tokens.append(')')
+
+
 if __name__ == "__main__":
     a = Implication(Variable("A"), Implication(Variable("D"),Variable("E")))
     b = Implication(Variable("C"), Variable("B"))
@@ -1,5 +1,6 @@
+import sys
 from App import *
 
 if __name__ == "__main__":
-    app = App()
+    app = App(sys.argv[1] if len(sys.argv) > 1 else None)
     app.run()
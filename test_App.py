@@ -0,0 +1,34 @@
+from App import App
+
+
+def run_commands(capsys, *lines):
+    app = App()
+    app.load_axioms()
+    for line in lines:
+        command, _, argument = line.partition(' ')
+        assert app.run_command(command, argument.strip())
+    return capsys.readouterr().out
+
+
+def test_library_command_errors_are_not_parse_errors(capsys):
+    out = run_commands(capsys, 'del 9', 'del x', 'save')
+    assert 'Ошибка разбора' not in out
+    assert 'Ошибка выполнения команды: Аксиомы с номером 9 нет' in out
+    assert 'Ошибка выполнения команды: Номер аксиомы должен быть числом' in out
+    assert 'Ошибка выполнения команды: Не указан путь к снапшоту' in out
+
+
+def test_duplicate_axiom_reports_existing_id(capsys):
+    out = run_commands(capsys, 'axiom A>A', 'axiom A>A', 'axiom A>(B>A)')
+    assert 'Аксиома добавлена под номером 4' in out
+    assert 'Такая аксиома уже есть под номером 4' in out
+    assert 'Такая аксиома уже есть под номером 1' in out
+
+
+def test_damaged_snapshot_falls_back_to_hilbert_axioms(tmp_path, capsys):
+    path = tmp_path / 'axioms.bin'
+    path.write_bytes(b'')
+    app = App(str(path))
+    app.load_axioms()
+    assert len(app.axioms) == 3
+    assert 'Используются аксиомы Гильберта' in capsys.readouterr().out
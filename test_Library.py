@@ -0,0 +1,95 @@
+import struct
+
+import pytest
+
+import Api
+from Library import AxiomLibrary, SNAPSHOT_ENTRY, SNAPSHOT_HEADER, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, encode_expression
+
+
+def make_library(*axioms):
+    library = AxiomLibrary()
+    for axiom in axioms:
+        library.add(Api.parse(axiom))
+    return library
+
+
+def test_snapshot_round_trip_keeps_ids(tmp_path):
+    library = make_library('A>(B>A)', 'A>A', 'A*B>A', 'A|!A')
+    library.remove(2)
+    path = tmp_path / 'axioms.bin'
+    library.save(path)
+
+    loaded = AxiomLibrary.load(path)
+    assert len(loaded) == 3
+    assert loaded.items() == library.items()
+    assert [axiom_id for axiom_id, _ in loaded.items()] == [1, 3, 4]
+    assert loaded.next_id == 5
+    assert loaded.find(Api.parse('A*B>A')) == 3
+    assert loaded.add(Api.parse('B>B')) == 5  # Номера удалённых аксиом не переиспользуются
+    assert str(loaded.remove(4)) == str(library.formulas[4])
+
+
+def test_snapshot_keeps_tautology_flags(tmp_path):
+    library = make_library('A>(B>A)', 'A', 'B>C')
+    assert library.tautologies == {1: True, 2: False, 3: False}
+    assert library.fixed_names() == {'A', 'B', 'C'}
+    path = tmp_path / 'axioms.bin'
+    library.save(path)
+    loaded = AxiomLibrary.load(path)
+    assert loaded.fixed_names() == {'A', 'B', 'C'}
+    loaded.remove(3)
+    assert loaded.fixed_names() == {'A'}
+
+
+def test_load_does_not_decode_formulas(tmp_path):
+    path = tmp_path / 'axioms.bin'
+    make_library('A>(B>A)', 'A>A').save(path)
+    loaded = AxiomLibrary.load(path)
+    assert loaded.snapshot is not None
+    assert loaded.formulas == {}
+    assert len(loaded) == 2
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'AXL',
+    b'ABCD' + bytes(SNAPSHOT_HEADER.size - 4),
+])
+def test_load_rejects_files_without_snapshot_header(tmp_path, data):
+    path = tmp_path / 'axioms.bin'
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        AxiomLibrary.load(path)
+
+
+def test_truncated_snapshot_raises_value_error(tmp_path):
+    path = tmp_path / 'axioms.bin'
+    make_library('A>(B>A)', '((A>(B>C))>((A>B)>(A>C)))').save(path)
+    data = path.read_bytes()
+    for size in range(SNAPSHOT_HEADER.size, len(data)):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            AxiomLibrary.load(path).materialize()
+
+
+def write_snapshot(path, entries, next_id):
+    buffer = bytearray(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(entries), next_id))
+    for axiom_id, axiom in entries:
+        buffer.extend(SNAPSHOT_ENTRY.pack(axiom_id, 0))
+        encode_expression(Api.parse(axiom), buffer)
+    path.write_bytes(buffer)
+
+
+@pytest.mark.parametrize('entries', [
+    [(1, 'A>A'), (1, 'B>B')],
+    [(1, 'A>A'), (2, 'A>A')],
+    [(0, 'A>A')],
+    [(3, 'A>A')],
+])
+def test_materialize_rejects_bad_entries(tmp_path, entries):
+    path = tmp_path / 'axioms.bin'
+    write_snapshot(path, entries, 3)
+    library = AxiomLibrary.load(path)
+    with pytest.raises(ValueError):
+        library.materialize()
+    assert library.formulas == {}  # Библиотека не заполняется частично
@@ -0,0 +1,74 @@
+import Api
+from Library import AxiomLibrary, HILBERT_AXIOMS
+from Prover import Prover
+from Utils import LemmaTable
+
+
+def make_prover(expression, lemmas=None, log=None):
+    return Prover(Api.load_axioms(None), Api.parse(expression), lemmas, log)
+
+
+def test_readme_a9_uses_lemmas():
+    messages = []
+    prover = make_prover('(A>C)>((B>C)>((A|B)>C))', log=messages.append)
+    assert prover.prove()
+    assert prover.lemmas.hits > 0
+    assert prover.lemmas.subsumed > 0
+    assert 'Секвент уже разбирается в другой ветви' in messages
+    assert prover.sequent.key() in prover.lemmas.proved  # Доказательство дошло по родителям до корня
+
+
+def test_waiting_sequents_are_closed_with_the_original():
+    messages = []
+    prover = make_prover('A*B>B', log=messages.append)
+    assert prover.prove()
+    assert messages.count('Секвент уже разбирается в другой ветви') == prover.lemmas.hits > 0
+    assert prover.sequent.key() in prover.lemmas.proved
+    assert not prover.lemmas.refuted
+
+
+def test_refutation_is_recorded_up_to_the_root():
+    prover = make_prover('A>B')
+    assert not prover.prove()
+    assert prover.sequent.key() in prover.lemmas.refuted
+    assert prover.sequent.key() not in prover.lemmas.proved
+
+
+def test_shared_lemma_table_answers_repeated_targets():
+    lemmas = LemmaTable()
+    assert make_prover('(A>C)>((B>C)>((A|B)>C))', lemmas).prove()
+    assert not make_prover('A>B', lemmas).prove()
+    hits, misses = lemmas.hits, lemmas.misses
+    assert make_prover('(A>C)>((B>C)>((A|B)>C))', lemmas).prove()
+    assert not make_prover('A>B', lemmas).prove()
+    assert (lemmas.hits, lemmas.misses) == (hits + 2, misses)
+
+
+def test_lemmas_do_not_change_results():
+    expressions = ['A*B>A', 'A*B>B', 'A>(B>(A*B))', 'A>(A|B)', 'B>(A|B)', '(A>C)>((B>C)>((A|B)>C))',
+                   '!A>(A>B)', 'A|!A', '(A=B)=(C=D)', 'A>B', '(A>B)>((B>C)>(A>C))', '(A|B)>(B|A)']
+    expected = [True, True, True, True, True, True, True, True, False, False, True, True]
+    assert [make_prover(expression).prove() for expression in expressions] == expected
+    lemmas = LemmaTable()
+    assert [make_prover(expression, lemmas).prove() for expression in expressions] == expected
+
+
+def test_prove_many_keeps_names_of_non_tautological_axioms():
+    assert Api.prove('B>A', axioms=['A'])
+    assert not Api.prove('A>B', axioms=['A'])
+    assert Api.prove_many(['B>A', 'A>B'], axioms=['A']) == [True, False]
+    assert Api.prove_many(['A>B', 'B>A'], axioms=['A']) == [False, True]
+    assert Api.prove_many(['A>B', 'B>A'], axioms=['A'], commutative=True) == [False, True]
+
+
+def test_prove_many_reads_tautology_flags_from_library():
+    library = AxiomLibrary()
+    for axiom in HILBERT_AXIOMS + ['A']:
+        library.add(Api.parse(axiom))
+    assert Api.prove_many(['B>A', 'A>B'], axioms=library) == [True, False]
+    assert Api.prove_many(['A>B', 'B>A'], axioms=library, commutative=True) == [False, True]
+
+
+def test_prove_many_merges_renamings_with_hilbert_axioms():
+    assert Api.prove_many(['A>(B>A)', 'C>(D>C)', 'A*B>B', 'B*A>A', 'A>B'], commutative=True) == \
+        [True, True, True, True, False]
@@ -0,0 +1,107 @@
+import random
+
+import Api
+import Utils
+from Utils import FormulaIndex, LemmaTable, SequentSide, Variable
+
+
+def linear_principal(formulas: dict):
+    """Выбор главной формулы перебором словаря, как до появления кучи"""
+    principal_expression = None
+    principal_depth = None
+    for expression, depth in formulas.items():
+        if principal_depth is None or principal_depth > depth:
+            if not isinstance(expression, Variable):
+                principal_expression = expression
+                principal_depth = depth
+    return principal_expression, principal_depth
+
+
+def test_sequent_side_depth_change_and_delete():
+    a, b, c = Api.parse('A>B'), Api.parse('!A'), Api.parse('B>C')
+    side = SequentSide(FormulaIndex(), {a: 1, b: 1, c: 2})
+    assert side.principal() == (a, 1)
+    side[a] = 3  # Старая запись a остаётся в куче устаревшей
+    assert side.stale == 1
+    assert side.principal() == (b, 1)
+    side[a] = 1  # Вернулась прежняя глубина, но порядок добавления a сохранился
+    assert side.principal() == (a, 1)
+    del side[a]  # a — вершина кучи, она снимается сразу
+    assert a not in side
+    assert side.principal() == (b, 1)
+    del side[c]  # c не на вершине, её запись становится устаревшей
+    assert side.stale > 0
+    copy = side.copy()  # Устаревших записей больше половины кучи — копия строится по сжатой куче
+    assert side.stale == copy.stale == 0
+    assert len(copy.heap) == 1
+    assert copy.principal() == (b, 1)
+    del copy[b]
+    assert copy.principal() == (None, None)
+    assert side.principal() == (b, 1)  # Копия независима от исходной части
+    assert side.bits == side.index.bit(b)
+
+
+def test_principal_matches_linear_scan():
+    formulas = [Api.parse(text) for text in ['A', 'B', 'A>B', '!A', '!B', 'B>A', '!(A>B)', '(A>B)>A']]
+    random.seed(1)
+    for _ in range(20):
+        index = FormulaIndex()
+        reference = {}
+        sides = [SequentSide(index)]
+        references = [reference]
+        for _ in range(200):
+            number = random.randrange(len(sides))
+            side, reference = sides[number], references[number]
+            expression = random.choice(formulas)
+            action = random.random()
+            if action < 0.1:
+                sides.append(side.copy())
+                references.append(dict(reference))
+            elif action < 0.4 and expression in reference:
+                del side[expression]
+                del reference[expression]
+            else:
+                depth = random.randrange(3)
+                side[expression] = depth
+                reference[expression] = depth
+            assert side.principal() == linear_principal(reference)
+            assert list(side) == list(reference)
+
+
+def test_lemma_table_exact_hits():
+    lemmas = LemmaTable()
+    lemmas.add_proved((0b001, 0b010))
+    lemmas.add_refuted((0b100, 0b010))
+    assert lemmas.lookup((0b001, 0b010)) is True
+    assert lemmas.lookup((0b100, 0b010)) is False
+    assert (lemmas.hits, lemmas.subsumed, lemmas.misses) == (2, 0, 0)
+
+
+def test_proved_lemma_closes_weaker_sequents():
+    lemmas = LemmaTable()
+    lemmas.add_proved((0b0001, 0b0100))
+    assert lemmas.lookup((0b0011, 0b1100)) is True  # Формулы добавлены с обеих сторон
+    assert lemmas.lookup((0b0010, 0b0100)) is None  # Нет формулы леммы слева
+    assert lemmas.lookup((0b0001, 0b1000)) is None  # Нет формулы леммы справа
+    assert (lemmas.hits, lemmas.subsumed, lemmas.misses) == (1, 1, 2)
+
+
+def test_refuted_lemma_answers_stronger_sequents():
+    lemmas = LemmaTable()
+    lemmas.add_refuted((0b0111, 0b1000))
+    assert lemmas.lookup((0b0101, 0b1000)) is False
+    assert lemmas.lookup((0b0001, 0)) is False
+    assert lemmas.lookup((0b0001, 0b10000)) is None  # Формулы справа нет в лемме
+    assert lemmas.lookup((0b1001, 0)) is None  # Формула слева есть в лемме только справа
+    assert (lemmas.hits, lemmas.subsumed, lemmas.misses) == (2, 2, 2)
+
+
+def test_subsumption_scans_only_recent_lemmas(monkeypatch):
+    lemmas = LemmaTable()
+    lemmas.add_proved((0b001, 0))
+    lemmas.add_proved((0b010, 0))
+    lemmas.add_proved((0b011, 0))  # Попадает в список той же опорной формулы, что и первая лемма
+    assert lemmas.lookup((0b101, 0)) is True
+    monkeypatch.setattr(Utils, 'SUBSUMPTION_CANDIDATES', 1)
+    assert lemmas.lookup((0b101, 0)) is None  # Первая лемма вне проверяемых: ответа нет, но и неверного ответа тоже
+    assert lemmas.lookup((0b001, 0)) is True  # Точное совпадение не ограничено